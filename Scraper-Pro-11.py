@@ -1,37 +1,30 @@
 import customtkinter as ctk
 from tkinter import messagebox, filedialog
-import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from urllib.parse import quote_plus
-import pandas as pd
-import time
 import json
-import re
 import threading
 from datetime import datetime
-import random
 import os
 import logging
-from webdriver_manager.chrome import ChromeDriverManager
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('scraper.log'),
-        logging.StreamHandler()
-    ]
+import time
+import webbrowser
+from typing import Callable, List
+from scraper_core import (
+    SCRAPER_CLASSES,
+    BrowserWorkerPool,
+    CsvSink,
+    ExtractionPool,
+    JobStore,
+    JsonLinesSink,
+    ProxyManager,
+    RateLimiter,
+    ThroughputController,
+    create_chrome_driver,
+    iter_result_file,
+    normalize_result,
+    parse_query_file,
+    run_job,
 )
+
 logger = logging.getLogger(__name__)
 
 # Application Constants
@@ -43,455 +36,175 @@ SUPPORT_CONTACTS = {
     "github": "https://github.com/yourusername/google-scraper-pro/issues"
 }
 
+# GUI platform names mapped to PLATFORMS keys
+PLATFORM_KEYS = {
+    "LinkedIn": "linkedin",
+    "Facebook": "facebook",
+    "Instagram": "instagram",
+    "Twitter": "twitter",
+    "Google Maps": "google_maps",
+}
+
 # UI Constants
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
 PADDING = 10
 BUTTON_WIDTH = 120
 BUTTON_HEIGHT = 32
+RESULT_ROW_HEIGHT = 84
 
-# Platform Settings
-PLATFORMS = {
-    "linkedin": {
-        "base_url": "https://www.linkedin.com",
-        "search_url": "https://www.linkedin.com/search/results/all/?keywords=",
-        "rate_limit": 2.5  # seconds between requests
-    },
-    "facebook": {
-        "base_url": "https://www.facebook.com",
-        "search_url": "https://www.facebook.com/search/top/?q=",
-        "rate_limit": 2.0
-    },
-    "instagram": {
-        "base_url": "https://www.instagram.com",
-        "search_url": "https://www.instagram.com/explore/tags/",
-        "rate_limit": 3.0
-    },
-    "twitter": {
-        "base_url": "https://twitter.com",
-        "search_url": "https://twitter.com/search?q=",
-        "rate_limit": 2.0
-    },
-    "google_maps": {
-        "base_url": "https://www.google.com/maps",
-        "search_url": "https://www.google.com/maps/search/",
-        "rate_limit": 2.0
-    }
-}
+# Proxies are re-validated before a search when older than this
+PROXY_REVALIDATE_SECONDS = 600
 
 # Set appearance
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
-class DataExtractor:
-    """Data extraction and cleaning functionality"""
-
-    @staticmethod
-    def extract_emails(text: str) -> List[str]:
-        """Extract email addresses from text"""
-        if not text:
-            return []
-            
-        email_pattern = r'[\w\.-]+@[\w\.-]+\.\w+'
-        emails = re.findall(email_pattern, text)
-        cleaned_emails = [
-            email.lower() for email in emails 
-            if len(email) > 5 and '.' in email.split('@')[1]
-        ]
-        return list(set(cleaned_emails))
-
-    @staticmethod
-    def extract_phones(text: str) -> List[str]:
-        """Extract phone numbers from text"""
-        if not text:
-            return []
-
-        phone_patterns = [
-            r'\+\d{1,4}[-\s]?\d{1,3}[-\s]?\d{3,4}[-\s]?\d{3,4}',
-            r'\d{3}[-\s]?\d{3}[-\s]?\d{4}',
-            r'00\d{1,3}[-\s]?\d{1,3}[-\s]?\d{3,4}[-\s]?\d{3,4}',
-            # Middle East Patterns
-            r'(?:971|0)?(?:2|3|4|6|7|9|50|51|52|55|56|58)\d{7}',  # UAE
-            r'(?:966|0)?(?:5|8|9)\d{8}',  # KSA
-            # Add more regional patterns as needed
-        ]
-
-        phones = []
-        for pattern in phone_patterns:
-            found = re.findall(pattern, text)
-            phones.extend(found)
-
-        cleaned_phones = []
-        for phone in phones:
-            cleaned = re.sub(r'[\s\(\)-]', '', phone)
-            if len(cleaned) >= 8:
-                cleaned_phones.append(cleaned)
-
-        return list(set(cleaned_phones))
-
-    @staticmethod
-    def clean_text(text: str) -> str:
-        """Clean and normalize text"""
-        if not text:
-            return ""
-        # Remove unwanted characters but keep essential ones
-        cleaned = re.sub(r'[^\w\s@+\(\)\-\.,]', '', text)
-        # Normalize whitespace
-        cleaned = ' '.join(cleaned.split())
-        return cleaned
-
-    @staticmethod
-    def extract_contact_info(text: str) -> Tuple[List[str], List[str]]:
-        """Extract both emails and phone numbers from text"""
-        cleaned_text = DataExtractor.clean_text(text)
-        emails = DataExtractor.extract_emails(cleaned_text)
-        phones = DataExtractor.extract_phones(cleaned_text)
-        return emails, phones
-
-class PlatformScraper:
-    """Base class for platform-specific scrapers"""
-    
-    def __init__(self, driver: webdriver.Chrome):
-        self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
-        self.data_extractor = DataExtractor()
-
-    def _wait_and_get_element(self, by, value, timeout=10):
-        """Safely wait for and return an element"""
-        try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((by, value))
-            )
-        except TimeoutException:
-            logger.warning(f"Timeout waiting for element: {value}")
-            return None
-
-    def _safe_click(self, element):
-        """Safely click an element with multiple attempts"""
-        try:
-            # Try regular click
-            element.click()
-        except:
-            try:
-                # Try JavaScript click
-                self.driver.execute_script("arguments[0].click();", element)
-            except Exception as e:
-                logger.error(f"Failed to click element: {str(e)}")
-                return False
-        return True
-
-    def _scroll_page(self, scroll_pause=1.0):
-        """Scroll page to load dynamic content"""
-        try:
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
-            while True:
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(scroll_pause)
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
-        except Exception as e:
-            logger.error(f"Error scrolling page: {str(e)}")
-
-class InstagramScraper(PlatformScraper):
-    """Instagram-specific scraping functionality"""
-
-    def login(self, username: str, password: str) -> bool:
-        """Login to Instagram"""
-        try:
-            self.driver.get("https://www.instagram.com/login")
-            time.sleep(random.uniform(2, 4))
-
-            # Enter username
-            username_input = self._wait_and_get_element(By.NAME, "username")
-            if username_input:
-                username_input.send_keys(username)
-
-            # Enter password
-            password_input = self._wait_and_get_element(By.NAME, "password")
-            if password_input:
-                password_input.send_keys(password)
-
-            # Click login button
-            login_button = self._wait_and_get_element(
-                By.CSS_SELECTOR, 
-                "button[type='submit']"
-            )
-            if login_button:
-                self._safe_click(login_button)
-
-            time.sleep(5)  # Wait for login to complete
-            
-            # Verify login success
-            try:
-                self._wait_and_get_element(By.CSS_SELECTOR, "nav[role='navigation']")
-                logger.info("Successfully logged into Instagram")
-                return True
-            except:
-                logger.error("Failed to verify Instagram login")
-                return False
-
-        except Exception as e:
-            logger.error(f"Instagram login failed: {str(e)}")
-            return False
-
-    def search_business(self, query: str) -> List[dict]:
-        """Search Instagram for business information"""
-        results = []
-        try:
-            encoded_query = quote_plus(query)
-            self.driver.get(f"https://www.instagram.com/explore/tags/{encoded_query}/")
-            time.sleep(random.uniform(2, 4))
-
-            # Scroll to load more content
-            self._scroll_page()
 
-            # Get post links
-            posts = self.driver.find_elements(By.CSS_SELECTOR, "article a")
-            
-            for post in posts[:10]:  # Limit to first 10 posts
-                try:
-                    # Click post to open
-                    self._safe_click(post)
-                    time.sleep(random.uniform(1, 2))
-
-                    # Extract user information
-                    username = self._wait_and_get_element(
-                        By.CSS_SELECTOR, 
-                        "header a"
-                    )
-                    if username:
-                        profile_url = username.get_attribute("href")
-                        
-                        # Visit profile
-                        self.driver.get(profile_url)
-                        time.sleep(random.uniform(1, 2))
-
-                        # Extract bio
-                        bio = self._wait_and_get_element(
-                            By.CSS_SELECTOR, 
-                            ".-vDIg span"
-                        )
-                        bio_text = bio.text if bio else ""
-
-                        # Extract contact information
-                        emails, phones = self.data_extractor.extract_contact_info(bio_text)
-
-                        results.append({
-                            'platform': 'Instagram',
-                            'username': username.text,
-                            'profile_url': profile_url,
-                            'bio': bio_text,
-                            'emails': emails,
-                            'phones': phones
-                        })
-
-                except Exception as e:
-                    logger.error(f"Error processing Instagram post: {str(e)}")
-                    continue
-
-        except Exception as e:
-            logger.error(f"Instagram search failed: {str(e)}")
-
-        return results
-
-class TwitterScraper(PlatformScraper):
-    """Twitter-specific scraping functionality"""
-
-    def search_business(self, query: str) -> List[dict]:
-        """Search Twitter for business information"""
-        results = []
-        try:
-            encoded_query = quote_plus(query)
-            self.driver.get(f"https://twitter.com/search?q={encoded_query}&f=user")
-            time.sleep(random.uniform(2, 4))
-
-            # Scroll to load more results
-            for _ in range(3):
-                self._scroll_page(scroll_pause=2.0)
-
-            # Find profile cards
-            profiles = self.driver.find_elements(
-                By.CSS_SELECTOR, 
-                '[data-testid="UserCell"]'
-            )
-
-            for profile in profiles[:10]:  # Limit to first 10 profiles
-                try:
-                    # Extract profile information
-                    name = profile.find_element(
-                        By.CSS_SELECTOR, 
-                        '[data-testid="UserName"]'
-                    ).text
-
-                    bio = profile.find_element(
-                        By.CSS_SELECTOR, 
-                        '[data-testid="UserDescription"]'
-                    ).text
-
-                    # Get profile URL
-                    profile_link = profile.find_element(
-                        By.CSS_SELECTOR, 
-                        'a[role="link"]'
-                    ).get_attribute('href')
-
-                    # Extract contact information
-                    emails, phones = self.data_extractor.extract_contact_info(bio)
-
-                    results.append({
-                        'platform': 'Twitter',
-                        'name': name,
-                        'profile_url': profile_link,
-                        'bio': bio,
-                        'emails': emails,
-                        'phones': phones
-                    })
-
-                except Exception as e:
-                    logger.error(f"Error processing Twitter profile: {str(e)}")
-                    continue
-
-        except Exception as e:
-            logger.error(f"Twitter search failed: {str(e)}")
-
-        return results
-
-class GoogleMapsScraper(PlatformScraper):
-    """Google Maps-specific scraping functionality"""
-
-    def search_business(self, query: str, location: str) -> List[dict]:
-        """Search Google Maps for business information"""
-        results = []
-        try:
-            search_query = f"{query} {location}".strip()
-            encoded_query = quote_plus(search_query)
-            self.driver.get(f"https://www.google.com/maps/search/{encoded_query}")
-            time.sleep(random.uniform(2, 4))
-
-            # Wait for results to load
-            self._wait_and_get_element(By.CLASS_NAME, "section-result")
-
-            # Scroll through results
-            for _ in range(3):
-                self.driver.execute_script(
-                    "document.getElementsByClassName('section-layout-root')[0].scrollTop += 1000"
-                )
-                time.sleep(2)
-
-            # Get business listings
-            businesses = self.driver.find_elements(By.CLASS_NAME, "section-result")
-
-            for business in businesses[:10]:  # Limit to first 10 businesses
-                try:
-                    # Click to open business details
-                    self._safe_click(business)
-                    time.sleep(random.uniform(1, 2))
-
-                    # Extract business information
-                    name = self._wait_and_get_element(
-                        By.CSS_SELECTOR, 
-                        ".section-result-title"
-                    )
-                    name_text = name.text if name else "N/A"
-
-                    # Get phone number
-                    phone = self._wait_and_get_element(
-                        By.CSS_SELECTOR, 
-                        "[data-item-id*='phone']"
-                    )
-                    phone_text = phone.text if phone else ""
-
-                    # Get website
-                    website = self._wait_and_get_element(
-                        By.CSS_SELECTOR, 
-                        "[data-item-id*='website']"
-                    )
-                    website_url = website.get_attribute("href") if website else ""
-
-                    # Get address
-                    address = self._wait_and_get_element(
-                        By.CSS_SELECTOR, 
-                        "[data-item-id*='address']"
-                    )
-                    address_text = address.text if address else ""
-
-                    # Extract additional contact information from website if available
-                    emails = []
-                    if website_url:
-                        try:
-                            response = requests.get(website_url, timeout=10)
-                            if response.status_code == 200:
-                                emails = self.data_extractor.extract_emails(response.text)
-                        except:
-                            pass
-
-                    results.append({
-                        'platform': 'Google Maps',
-                        'name': name_text,
-                        'address': address_text,
-                        'phone': [phone_text] if phone_text else [],
-                        'website': website_url,
-                        'emails': emails
-                    })
-
-                    # Go back to results
-                    self.driver.execute_script("window.history.go(-1)")
-                    time.sleep(1)
-
-                except Exception as e:
-                    logger.error(f"Error processing Google Maps business: {str(e)}")
-                    continue
-
-        except Exception as e:
-            logger.error(f"Google Maps search failed: {str(e)}")
-
-        return results
-
-class ProxyManager:
-    """Manage proxy rotation and validation"""
-    
-    def __init__(self, proxy_list_path: str = None):
-        self.proxies = []
-        self.current_index = 0
-        if proxy_list_path and os.path.exists(proxy_list_path):
-            with open(proxy_list_path, 'r') as f:
-                self.proxies = [line.strip() for line in f if line.strip()]
-
-    def get_next_proxy(self) -> str:
-        """Get next proxy from the list"""
-        if not self.proxies:
-            return None
-        
-        proxy = self.proxies[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.proxies)
-        return proxy
+def format_result_row(result: dict) -> tuple:
+    """(title, details, contacts, url, copy_text) shown for one result"""
+    entity = normalize_result(result)
+    # Phones are shown as scraped; the E.164 form is only a matching key
+    phones = result.get('phones') or result.get('phone') or []
+    if isinstance(phones, str):
+        phones = [phones]
+    phones = list(dict.fromkeys(phone.strip() for phone in phones if phone.strip()))
+    title = entity['name'] or 'N/A'
+    details = " | ".join(
+        value for value in (entity['platform'], entity['address'], entity['query']) if value
+    ) or 'N/A'
+    contacts = "   ".join(
+        text for text in (
+            f"📧 {', '.join(entity['emails'])}" if entity['emails'] else "",
+            f"📱 {', '.join(phones)}" if phones else "",
+        ) if text
+    )
+    url = entity['profile_url'] or entity['website'] or ""
+    copy_text = "\n".join(line for line in (title, details, contacts, url) if line)
+    return title, details, contacts, url, copy_text
+
+class ResultsView(ctk.CTkFrame):
+    """Virtualized result list
+
+    Only enough row widgets to fill the visible height are created; the
+    scrollbar and mouse wheel move a window over the row data and the same
+    widgets are refilled, so the view costs the same at 100 or 100k rows.
+    """
+
+    def __init__(self, master, on_open: Callable[[str], None], on_copy: Callable[[str], None], **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_open = on_open
+        self.on_copy = on_copy
+        self.rows = []
+        self.first = 0
+        self._slots = []
+        self._visible = 1
+        self._render_pending = False
+
+        self.count_label = ctk.CTkLabel(self, text="No results")
+        self.count_label.pack(anchor="w", padx=5)
+        body = ctk.CTkFrame(self)
+        body.pack(fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(body, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas = ctk.CTkFrame(body, fg_color="transparent")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.bind("<Enter>", lambda event: self._bind_wheel(True))
+        self.bind("<Leave>", lambda event: self._bind_wheel(False))
+
+    def _make_slot(self) -> dict:
+        frame = ctk.CTkFrame(self.canvas, height=RESULT_ROW_HEIGHT)
+        frame.pack_propagate(False)
+        index = len(self._slots)
+        buttons = ctk.CTkFrame(frame, fg_color="transparent")
+        buttons.pack(side="right", padx=5)
+        ctk.CTkButton(buttons, text="Open URL", width=BUTTON_WIDTH,
+                      command=lambda: self._act(index, self.on_open, 3)).pack(pady=2)
+        ctk.CTkButton(buttons, text="Copy Info", width=BUTTON_WIDTH,
+                      command=lambda: self._act(index, self.on_copy, 4)).pack(pady=2)
+        labels = [
+            ctk.CTkLabel(frame, text="", font=("Arial", 12, "bold"), anchor="w"),
+            ctk.CTkLabel(frame, text="", anchor="w"),
+            ctk.CTkLabel(frame, text="", anchor="w"),
+        ]
+        for label in labels:
+            label.pack(fill="x", padx=5)
+        return {'frame': frame, 'labels': labels}
+
+    def _act(self, slot: int, callback: Callable[[str], None], field: int):
+        row_index = self.first + slot
+        if row_index < len(self.rows):
+            callback(self.rows[row_index][field])
+
+    def _bind_wheel(self, active: bool):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            if active:
+                self.bind_all(sequence, self._on_wheel)
+            else:
+                self.unbind_all(sequence)
+
+    def _on_wheel(self, event):
+        if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0:
+            self.scroll_to(self.first - 3)
+        else:
+            self.scroll_to(self.first + 3)
+
+    def _on_scrollbar(self, action: str, *args):
+        if action == "moveto":
+            self.scroll_to(round(float(args[0]) * len(self.rows)))
+        elif action == "scroll":
+            step = self._visible if args[1] == "pages" else 1
+            self.scroll_to(self.first + int(args[0]) * step)
+
+    def _on_resize(self, event):
+        self._visible = max(1, event.height // (RESULT_ROW_HEIGHT + 4))
+        while len(self._slots) < self._visible:
+            self._slots.append(self._make_slot())
+        self._schedule_render()
+
+    def scroll_to(self, first: int):
+        """Show rows starting at index first"""
+        self.first = max(0, min(first, len(self.rows) - self._visible))
+        self._schedule_render()
+
+    def append(self, rows: List[tuple]):
+        """Add formatted rows; must be called on the Tk thread"""
+        self.rows.extend(rows)
+        self._schedule_render()
+
+    def clear(self):
+        """Drop all rows"""
+        self.rows = []
+        self.first = 0
+        self._schedule_render()
+
+    def _schedule_render(self):
+        # Bursts of appends and scroll events collapse into one redraw
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _render(self):
+        self._render_pending = False
+        total = len(self.rows)
+        for slot_index, slot in enumerate(self._slots):
+            row_index = self.first + slot_index
+            if slot_index < self._visible and row_index < total:
+                for label, text in zip(slot['labels'], self.rows[row_index]):
+                    label.configure(text=text)
+                if not slot['frame'].winfo_manager():
+                    slot['frame'].pack(fill="x", padx=5, pady=2)
+            elif slot['frame'].winfo_manager():
+                slot['frame'].pack_forget()
+        if total:
+            last = min(total, self.first + self._visible)
+            self.count_label.configure(text=f"Rows {self.first + 1:,}–{last:,} of {total:,}")
+            self.scrollbar.set(self.first / total, last / total)
+        else:
+            self.count_label.configure(text="No results")
+            self.scrollbar.set(0.0, 1.0)
 
-    def validate_proxy(self, proxy: str) -> bool:
-        """Validate proxy connectivity"""
-        try:
-            response = requests.get(
-                'https://www.google.com',
-                proxies={'http': proxy, 'https': proxy},
-                timeout=5
-            )
-            return response.status_code == 200
-        except:
-            return False
-
-class RateLimiter:
-    """Manage request rate limiting"""
-    
-    def __init__(self, requests_per_minute: int = 30):
-        self.delay = 60.0 / requests_per_minute
-        self.last_request = 0
-
-    def wait(self):
-        """Wait appropriate time before next request"""
-        now = time.time()
-        time_passed = now - self.last_request
-        if time_passed < self.delay:
-            time.sleep(self.delay - time_passed)
-        self.last_request = time.time()
 class ScraperApp(ctk.CTk):
     """Main application class"""
 
@@ -504,10 +217,19 @@ class ScraperApp(ctk.CTk):
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
         # Initialize components
-        self.scraper = None
+        self.browser_pool = None
         self.proxy_manager = ProxyManager('proxies.txt')
-        self.rate_limiter = RateLimiter()
-        self.results = []
+        # Shared by every browser pool, so platform limits survive pool rebuilds
+        self.rate_limiter = RateLimiter.for_platforms()
+        # Tunes platform rates from observed page loads, up to the
+        # "Requests per minute" setting
+        self.throughput_controller = ThroughputController(self.rate_limiter)
+        self.extraction_pool = None
+        self.result_sink = None
+        self.results_path = None
+        self.result_count = 0
+        self.job_store = None
+        self.query_list = None
         self.stop_search_flag = False
         self.current_task = None
 
@@ -561,6 +283,15 @@ class ScraperApp(ctk.CTk):
         self.location = ctk.CTkEntry(criteria_frame, width=300)
         self.location.grid(row=2, column=1, padx=5, pady=5)
 
+        # Query list; the location above is the default for its queries
+        ctk.CTkButton(
+            criteria_frame,
+            text="Load Queries",
+            command=self.load_query_list
+        ).grid(row=3, column=0, padx=5, pady=5)
+        self.query_list_label = ctk.CTkLabel(criteria_frame, text="No query list loaded")
+        self.query_list_label.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+
         # Platform selection
         platforms_frame = ctk.CTkFrame(self.search_tab)
         platforms_frame.pack(fill="x", padx=10, pady=5)
@@ -639,8 +370,8 @@ class ScraperApp(ctk.CTk):
         ).pack(side="left", padx=5)
 
         # Results display
-        self.results_frame = ctk.CTkScrollableFrame(self.results_tab)
-        self.results_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.results_view = ResultsView(self.results_tab, on_open=self.open_url, on_copy=self.copy_info)
+        self.results_view.pack(fill="both", expand=True, padx=10, pady=5)
 
     def setup_settings_tab(self):
         """Setup settings interface"""
@@ -673,6 +404,73 @@ class ScraperApp(ctk.CTk):
         rate_entry = ctk.CTkEntry(rate_frame, textvariable=self.rate_limit_var, width=100)
         rate_entry.pack(side="left", padx=5)
 
+        # Extraction process pool
+        extraction_frame = ctk.CTkFrame(settings_frame)
+        extraction_frame.pack(fill="x", padx=10, pady=5)
+
+        ctk.CTkLabel(extraction_frame, text="Extraction workers (0 = off):").pack(side="left")
+
+        self.extraction_workers_var = ctk.StringVar(value="0")
+        workers_entry = ctk.CTkEntry(extraction_frame, textvariable=self.extraction_workers_var, width=100)
+        workers_entry.pack(side="left", padx=5)
+
+        # Concurrent browser sessions
+        browser_frame = ctk.CTkFrame(settings_frame)
+        browser_frame.pack(fill="x", padx=10, pady=5)
+
+        ctk.CTkLabel(browser_frame, text="Browser workers:").pack(side="left")
+
+        self.browser_workers_var = ctk.StringVar(value="3")
+        browser_entry = ctk.CTkEntry(browser_frame, textvariable=self.browser_workers_var, width=100)
+        browser_entry.pack(side="left", padx=5)
+
+        ctk.CTkLabel(browser_frame, text="Recycle after pages:").pack(side="left")
+
+        self.max_pages_per_session_var = ctk.StringVar(value="50")
+        recycle_entry = ctk.CTkEntry(browser_frame, textvariable=self.max_pages_per_session_var, width=100)
+        recycle_entry.pack(side="left", padx=5)
+
+    def get_extraction_pool(self):
+        """Return the extraction process pool configured in settings, if enabled"""
+        try:
+            workers = int(self.extraction_workers_var.get())
+        except ValueError:
+            workers = 0
+
+        if workers <= 0:
+            if self.extraction_pool:
+                self.extraction_pool.shutdown()
+                self.extraction_pool = None
+            return None
+
+        pool = self.extraction_pool
+        if not pool or pool.max_workers != workers:
+            if pool:
+                pool.shutdown()
+            self.extraction_pool = ExtractionPool(workers)
+        return self.extraction_pool
+
+    def browse_proxy_file(self):
+        """Load proxies from a file and validate them in the background"""
+        path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        self.proxy_file_var.set(path)
+        try:
+            self.proxy_manager.load(path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load proxies: {str(e)}")
+            logger.error(f"Proxy file error: {str(e)}")
+            return
+        self.update_status(f"Validating {len(self.proxy_manager.proxies)} proxies...")
+        threading.Thread(target=self.validate_proxies, daemon=True).start()
+
+    def validate_proxies(self):
+        """Check every proxy and report how many are usable; keep checking in the background"""
+        results = self.proxy_manager.validate_all()
+        self.update_status(f"{sum(results.values())} of {len(results)} proxies healthy")
+        self.proxy_manager.start_health_checks()
+
     def setup_about_tab(self):
         """Setup about and support information"""
         about_frame = ctk.CTkFrame(self.about_tab)
@@ -701,15 +499,40 @@ class ScraperApp(ctk.CTk):
             justify="left"
         ).pack(pady=10)
 
+    def load_query_list(self):
+        """Load a query file to search instead of the single job title"""
+        path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        if not path:
+            self.query_list = None
+            self.query_list_label.configure(text="No query list loaded")
+            return
+        try:
+            self.query_list = parse_query_file(path, with_priority=True)
+            self.query_list_label.configure(
+                text=f"{len(self.query_list)} queries from {os.path.basename(path)}"
+            )
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load queries: {str(e)}")
+            logger.error(f"Query file error: {str(e)}")
+
+    def get_queries(self) -> List[tuple]:
+        """(query, location, priority) items to search"""
+        location = self.location.get().strip()
+        if self.query_list:
+            return [(query, query_location or location, priority)
+                    for query, query_location, priority in self.query_list]
+        query = f"{self.job_title.get()} {self.company.get()}".strip()
+        return [(query, location, 0)]
+
     def start_search(self):
         """Start search operation"""
-        if not self.job_title.get():
-            messagebox.showerror("Error", "Please enter a job title")
+        if not self.job_title.get() and not self.query_list:
+            messagebox.showerror("Error", "Please enter a job title or load a query list")
             return
 
         self.search_button.configure(state="disabled")
         self.stop_button.configure(state="normal")
-        self.results = []
+        self.open_result_sink()
         self.clear_results_display()
         self.stop_search_flag = False
 
@@ -720,125 +543,189 @@ class ScraperApp(ctk.CTk):
         )
         self.current_task.start()
 
+    def open_result_sink(self):
+        """Start a new run file that results are streamed into"""
+        self.close_result_sink()
+        self.results_path = f"scraper_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        # Searches are checkpointed and a task counts as delivered once its
+        # results are written, so don't buffer them
+        self.result_sink = JsonLinesSink(self.results_path, flush_every=1)
+        self.result_count = 0
+
+    def close_result_sink(self):
+        """Flush and close the current run file"""
+        if self.result_sink:
+            self.result_sink.close()
+            self.result_sink = None
+
+    def stop_search(self):
+        """Stop the running search after the current items; it resumes when started again"""
+        self.stop_search_flag = True
+        self.stop_button.configure(state="disabled")
+        self.update_status("Stopping... start the same search again to resume.")
+
+    def get_browser_pool(self) -> BrowserWorkerPool:
+        """Return the browser worker pool sized from settings"""
+        try:
+            size = max(1, int(self.browser_workers_var.get()))
+        except ValueError:
+            size = 3
+        try:
+            max_pages = max(1, int(self.max_pages_per_session_var.get()))
+        except ValueError:
+            max_pages = 50
+        try:
+            self.throughput_controller.set_max_requests_per_minute(max(1.0, float(self.rate_limit_var.get())))
+        except ValueError:
+            self.throughput_controller.set_max_requests_per_minute(30.0)
+
+        use_proxy = self.use_proxy_var.get()
+        pool = self.browser_pool
+        if (not pool or pool.size != size or pool.driver_pool.max_pages_per_session != max_pages
+                or (pool.proxy_manager is not None) != use_proxy):
+            if pool:
+                pool.close()
+            self.browser_pool = BrowserWorkerPool(
+                size,
+                driver_factory=lambda: create_chrome_driver(
+                    proxy=self.proxy_manager.require_proxy() if use_proxy else None
+                ),
+                extraction_pool=self.get_extraction_pool(),
+                max_pages_per_session=max_pages,
+                rate_limiter=self.rate_limiter,
+                throughput_controller=self.throughput_controller,
+                proxy_manager=self.proxy_manager if use_proxy else None,
+            )
+        else:
+            pool.extraction_pool = self.get_extraction_pool()
+        return self.browser_pool
+
     def search_all_platforms(self):
-        """Search across all selected platforms"""
+        """Search across all selected platforms concurrently"""
         try:
-            # Initialize browser if needed
-            if not self.scraper:
-                self.update_status("Initializing browser...")
-                self.scraper = self.initialize_scraper()
+            queries = self.get_queries()
 
-            total_results = 0
-            selected_platforms = [
-                platform for platform, var in self.platform_vars.items() 
-                if var.get()
-            ]
-
-            for i, platform in enumerate(selected_platforms):
-                if self.stop_search_flag:
-                    break
-
-                self.update_status(f"Searching {platform}...")
-                self.progress.set((i + 1) / len(selected_platforms))
-
-                try:
-                    if platform == "LinkedIn":
-                        results = self.search_linkedin()
-                    elif platform == "Facebook":
-                        results = self.search_facebook()
-                    elif platform == "Instagram":
-                        results = self.search_instagram()
-                    elif platform == "Twitter":
-                        results = self.search_twitter()
-                    elif platform == "Google Maps":
-                        results = self.search_google_maps()
-
-                    self.process_results(results)
-                    total_results += len(results)
-
-                except Exception as e:
-                    logger.error(f"Error searching {platform}: {str(e)}")
+            selected_platforms = []
+            for platform, var in self.platform_vars.items():
+                if not var.get():
                     continue
+                if PLATFORM_KEYS[platform] in SCRAPER_CLASSES:
+                    selected_platforms.append(PLATFORM_KEYS[platform])
+                else:
+                    logger.warning(f"{platform} search is not supported yet, skipping")
+
+            if not selected_platforms:
+                self.update_status("No supported platform selected.")
+                return
+
+            # Searches are checkpointed; repeating a stopped or crashed
+            # search picks up where it ended
+            if not self.job_store:
+                self.job_store = JobStore('jobs.sqlite')
+            job_id, resumed = self.job_store.resume_or_create(queries, selected_platforms)
+            total_tasks = len(queries) * len(selected_platforms)
+            done_tasks = self.job_store.progress(job_id).get('done', 0)
+
+            # Never fall back to a direct connection when proxies were asked for
+            if self.use_proxy_var.get():
+                if time.time() - self.proxy_manager.validated_at > PROXY_REVALIDATE_SECONDS:
+                    self.update_status("Validating proxies...")
+                    self.validate_proxies()
+                if self.proxy_manager.get_next_proxy() is None:
+                    logger.error("Proxy use is enabled but no proxy is healthy; not starting search")
+                    self.update_status("No working proxy. Load a proxy file or disable proxies.")
+                    return
+
+            self.update_status("Starting browsers...")
+            pool = self.get_browser_pool()
+            self.update_status(
+                f"{'Resuming' if resumed else 'Searching'} {len(queries)} queries on "
+                f"{len(selected_platforms)} platforms with {pool.size} browsers..."
+            )
 
-            self.update_status(f"Search complete. Found {total_results} results.")
+            total_results = 0
+            busy_time = 0.0
+            start = time.perf_counter()
+            searches = run_job(
+                pool,
+                self.job_store,
+                job_id,
+                should_stop=lambda: self.stop_search_flag
+            )
+            for task, results, elapsed in searches:
+                busy_time += elapsed
+                done_tasks += 1
+                self.progress.set(done_tasks / total_tasks)
+                self.update_status(
+                    f"{task['platform']} '{task['query']}': {len(results)} results in {elapsed:.1f}s "
+                    f"({done_tasks}/{total_tasks})"
+                )
+                for result in results:
+                    result['query'] = task['query']
+                self.process_results(results)
+                total_results += len(results)
+
+            wall_time = time.perf_counter() - start
+            speedup = busy_time / wall_time if wall_time > 0 else 1.0
+            self.update_status(
+                f"Search complete. Found {total_results} results in {wall_time:.1f}s "
+                f"({speedup:.1f}x vs sequential {busy_time:.1f}s)."
+            )
 
         except Exception as e:
             self.update_status(f"Search failed: {str(e)}")
             logger.error(f"Search error: {str(e)}")
 
         finally:
+            self.close_result_sink()
             self.search_button.configure(state="normal")
             self.stop_button.configure(state="disabled")
             self.progress.set(0)
 
+    def update_status(self, message: str):
+        """Update the status label from any thread"""
+        self.after(0, lambda: self.status_label.configure(text=message))
+
+    def clear_results_display(self):
+        """Remove all displayed results"""
+        self.results_view.clear()
+
     def process_results(self, results: List[dict]):
         """Process and display search results"""
+        # Results already scraped are kept even after Stop; the job
+        # checkpoint treats them as delivered
+        rows = []
         for result in results:
-            if self.stop_search_flag:
-                break
-
-            self.results.append(result)
-            self.add_result_to_display(result)
-
-    def add_result_to_display(self, result: dict):
-        """Add a single result to the display"""
-        result_frame = ctk.CTkFrame(self.results_frame)
-        result_frame.pack(fill="x", padx=5, pady=2)
-
-        # Title
-        ctk.CTkLabel(
-            result_frame,
-            text=result.get('title', 'N/A'),
-            font=("Arial", 12, "bold")
-        ).pack(anchor="w")
-
-        # Platform and other details
-        details = f"{result.get('platform', 'N/A')} | {result.get('company', 'N/A')}"
-        ctk.CTkLabel(
-            result_frame,
-            text=details
-        ).pack(anchor="w")
-
-        # Contact information
-        if result.get('emails'):
-            ctk.CTkLabel(
-                result_frame,
-                text=f"📧 {', '.join(result['emails'])}"
-            ).pack(anchor="w")
-
-        if result.get('phones'):
-            ctk.CTkLabel(
-                result_frame,
-                text=f"📱 {', '.join(result['phones'])}"
-            ).pack(anchor="w")
-
-        # Action buttons
-        button_frame = ctk.CTkFrame(result_frame)
-        button_frame.pack(fill="x")
-
-        ctk.CTkButton(
-            button_frame,
-            text="Open URL",
-            command=lambda: self.open_url(result.get('url', ''))
-        ).pack(side="left", padx=5)
-
-        ctk.CTkButton(
-            button_frame,
-            text="Copy Info",
-            command=lambda: self.copy_info(result)
-        ).pack(side="left", padx=5)
+            self.result_sink.write(result)
+            self.result_count += 1
+            rows.append(format_result_row(result))
+        self.after(0, lambda: self.results_view.append(rows))
+
+    def open_url(self, url: str):
+        """Open a result's URL in the default browser"""
+        if url:
+            webbrowser.open(url)
+
+    def copy_info(self, text: str):
+        """Copy a result's details to the clipboard"""
+        self.clipboard_clear()
+        self.clipboard_append(text)
+        self.update_status("Copied to clipboard")
 
     def export_csv(self):
         """Export results to CSV"""
-        if not self.results:
+        if not self.result_count:
             messagebox.showwarning("Warning", "No results to export")
             return
 
         try:
             filename = f"scraper_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            
-            df = pd.DataFrame(self.results)
-            df.to_csv(filename, index=False, encoding='utf-8-sig')
+
+            # Convert the run file record by record
+            if self.result_sink:
+                self.result_sink.flush()
+            with CsvSink(filename) as sink:
+                sink.write_many(iter_result_file(self.results_path))
             
             messagebox.showinfo("Success", f"Results exported to {filename}")
             os.startfile(os.path.dirname(os.path.abspath(filename)))
@@ -848,15 +735,22 @@ class ScraperApp(ctk.CTk):
 
     def export_json(self):
         """Export results to JSON"""
-        if not self.results:
+        if not self.result_count:
             messagebox.showwarning("Warning", "No results to export")
             return
 
         try:
             filename = f"scraper_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            
+
+            # Stream the run file into a JSON array without loading it
+            if self.result_sink:
+                self.result_sink.flush()
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.results, f, indent=4, ensure_ascii=False)
+                f.write('[')
+                for i, result in enumerate(iter_result_file(self.results_path)):
+                    item = json.dumps(result, indent=4, ensure_ascii=False)
+                    f.write((',\n    ' if i else '\n    ') + item.replace('\n', '\n    '))
+                f.write('\n]')
             
             messagebox.showinfo("Success", f"Results exported to {filename}")
             os.startfile(os.path.dirname(os.path.abspath(filename)))
@@ -868,8 +762,14 @@ class ScraperApp(ctk.CTk):
         """Handle application closing"""
         if messagebox.askokcancel("Quit", "Do you want to quit?"):
             self.stop_search_flag = True
-            if self.scraper:
-                self.scraper.quit()
+            if self.browser_pool:
+                self.browser_pool.close()
+            if self.extraction_pool:
+                self.extraction_pool.shutdown()
+            self.close_result_sink()
+            if self.job_store:
+                self.job_store.close()
+            self.proxy_manager.close()
             self.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,444 @@
+"""Record/replay benchmark harness for Scraper Pro
+
+Serves recorded pages from a local fixture server and runs each platform's
+search_business end-to-end against it, so scraper throughput can be
+measured without hitting the live sites and compared between changes.
+
+Fixtures are recorded with the batch CLI's snapshot store:
+    python scraper_cli.py queries.txt -p twitter --snapshots fixtures/
+
+and replayed with:
+    python scraper_bench.py --fixtures fixtures/ queries.txt -p twitter
+
+Without --fixtures a synthetic fixture set is generated, which is enough
+to benchmark the scraping logic itself. Use --baseline to fail the run
+when throughput regresses against a previous report.
+"""
+
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qsl, quote_plus, unquote_plus, urlencode, urlsplit
+
+import scraper_core
+from scraper_core import ContactExtractionEngine, PLATFORMS, SCRAPER_CLASSES, logger
+
+
+def _fixture_key(url: str) -> Tuple[str, str, str]:
+    """Normalize a URL to (host, path, query) for fixture lookup"""
+    parts = urlsplit(url)
+    path = unquote_plus(parts.path).rstrip('/') or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return parts.netloc.lower(), path, query
+
+
+class FixtureServer:
+    """Local HTTP server replaying recorded pages
+
+    A page recorded for https://<host><path> is served at
+    <server>/<host><path>. Links to recorded hosts, absolute or
+    root-relative, are rewritten so navigation stays on the server.
+    Unknown URLs fall back to a page recorded at the same path with a
+    different query, then to the shortest recorded path extending it
+    (e.g. Maps search URLs that gained an @lat,lng suffix).
+    """
+
+    def __init__(self, pages: Dict[str, str] = None, host: str = '127.0.0.1', port: int = 0):
+        self.pages = {}
+        self.requests_served = 0
+        self.misses = 0
+        for url, html in (pages or {}).items():
+            self.add_page(url, html)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self.url = f"http://{host}:{self._httpd.server_address[1]}"
+        self._rewritten = {}
+        self._thread = None
+
+    @classmethod
+    def from_snapshot_store(cls, store: scraper_core.SnapshotStore, **kwargs) -> 'FixtureServer':
+        """Serve every page in a snapshot store, latest recording winning"""
+        server = cls(**kwargs)
+        for entry, html in store.iter_pages():
+            server.add_page(entry['url'], html)
+        return server
+
+    def add_page(self, url: str, html: str):
+        self.pages[_fixture_key(url)] = html
+
+    def local_url(self, url: str) -> str:
+        """Server URL replaying the recorded url"""
+        parts = urlsplit(url)
+        local = f"{self.url}/{parts.netloc}{parts.path}"
+        return f"{local}?{parts.query}" if parts.query else local
+
+    def start(self) -> 'FixtureServer':
+        self._rewritten = self._rewrite_pages()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Serving {len(self.pages)} fixture pages at {self.url}")
+        return self
+
+    def close(self):
+        if self._thread:
+            self._httpd.shutdown()
+            self._thread = None
+        self._httpd.server_close()
+
+    def _rewrite_pages(self) -> Dict[Tuple[str, str, str], bytes]:
+        """Point links to recorded hosts at the server, once up front"""
+        hosts = sorted({host for host, _, _ in self.pages}, key=len, reverse=True)
+        absolute = re.compile(
+            r'(?:https?:)?//(' + '|'.join(re.escape(host) for host in hosts) + r')(?=[/"\'?#\s]|$)',
+            re.IGNORECASE
+        ) if hosts else None
+        root_relative = re.compile(r'((?:href|src|action)=["\'])/(?!/)', re.IGNORECASE)
+
+        rewritten = {}
+        for (host, path, query), html in self.pages.items():
+            html = root_relative.sub(rf'\1/{host}/', html)
+            if absolute:
+                html = absolute.sub(lambda m: f"{self.url}/{m.group(1).lower()}", html)
+            rewritten[(host, path, query)] = html.encode('utf-8')
+        return rewritten
+
+    def _lookup(self, request_path: str) -> bytes:
+        host, _, rest = request_path.lstrip('/').partition('/')
+        host, path, query = _fixture_key(f"https://{host}/{rest}")
+        body = self._rewritten.get((host, path, query))
+        if body is not None:
+            return body
+
+        candidates = sorted(
+            (len(key[1]), key) for key in self._rewritten
+            if key[0] == host and (key[1] == path or (path != '/' and key[1].startswith(path + '/')))
+        )
+        return self._rewritten[candidates[0][1]] if candidates else None
+
+    def _handler_class(self):
+        server = self
+
+        class FixtureHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = server._lookup(self.path)
+                with server._lock:
+                    server.requests_served += 1
+                    if body is None:
+                        server.misses += 1
+                if body is None:
+                    logger.warning(f"No fixture for {self.path}")
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return FixtureHandler
+
+
+def synthetic_fixtures(queries: List[Tuple[str, str]], count: int = 10) -> Dict[str, str]:
+    """Generate pages for every platform's search flow, `count` results per query"""
+    pages = {}
+    instagram = PLATFORMS['instagram']['base_url']
+    twitter = PLATFORMS['twitter']['base_url']
+    maps = PLATFORMS['google_maps']['base_url']
+    site = "https://www.example-business.com"
+
+    def page(body: str) -> str:
+        return f"<html><head><title>fixture</title></head><body>{body}</body></html>"
+
+    def contact(i: int) -> str:
+        return f"Call +971 50 123 {i:04d} or mail info{i}@example-business.com"
+
+    for query, location in queries:
+        slug = re.sub(r'\W+', '-', query.lower()).strip('-')
+
+        # Instagram: tag page -> post -> profile
+        search_query = f"{query} {location}".strip()
+        posts = "".join(
+            f'<a href="{instagram}/p/{slug}-{i}/">post {i}</a>' for i in range(count)
+        )
+        pages[f"{instagram}/explore/tags/{quote_plus(search_query)}/"] = page(f"<article>{posts}</article>")
+        for i in range(count):
+            pages[f"{instagram}/p/{slug}-{i}/"] = page(
+                f'<header><a href="{instagram}/{slug}{i}/">{slug}{i}</a></header>'
+            )
+            pages[f"{instagram}/{slug}{i}/"] = page(
+                f'<nav role="navigation"></nav><div class="-vDIg"><span>{contact(i)}</span></div>'
+            )
+
+        # Twitter: one user search results page
+        cells = "".join(
+            f'<div data-testid="UserCell"><a role="link" href="{twitter}/{slug}{i}">'
+            f'<span data-testid="UserName">{query} {i}</span></a>'
+            f'<div data-testid="UserDescription">{contact(i)}</div></div>'
+            for i in range(count)
+        )
+        pages[f"{twitter}/search?q={quote_plus(search_query)}&f=user"] = page(cells)
+
+        # Google Maps: listing -> details page -> business website
+        listings = "".join(
+            f'<a class="section-result" href="{maps}/place/{slug}-{i}">{query} {i}</a>'
+            for i in range(count)
+        )
+        pages[f"{maps}/search/{quote_plus(search_query)}"] = page(
+            f'<div class="section-layout-root">{listings}</div>'
+        )
+        for i in range(count):
+            pages[f"{maps}/place/{slug}-{i}"] = page(
+                f'<h1 class="section-result-title">{query} {i}</h1>'
+                f'<button data-item-id="address">{i} Fixture Street, {location}</button>'
+                f'<button data-item-id="phone:tel">+971 4 555 {i:04d}</button>'
+                f'<a data-item-id="authority-website" href="{site}/{slug}-{i}">website</a>'
+            )
+            pages[f"{site}/{slug}-{i}"] = page(f"<p>{contact(i)}</p>")
+
+    return pages
+
+
+class _CallTimer:
+    """Accumulate time spent in selected functions while installed
+
+    Nested timed calls (parse_page calling ContactExtractionEngine.extract)
+    are only counted once.
+    """
+
+    def __init__(self, targets: List[Tuple[type, str]]):
+        self.targets = targets
+        self.seconds = 0.0
+        self.calls = 0
+        self._local = threading.local()
+        self._originals = []
+
+    def _wrap(self, func):
+        def timed(*args, **kwargs):
+            depth = getattr(self._local, 'depth', 0)
+            self._local.depth = depth + 1
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._local.depth = depth
+                if not depth:
+                    self.seconds += time.perf_counter() - start
+                    self.calls += 1
+        return timed
+
+    def __enter__(self):
+        for owner, name in self.targets:
+            original = owner.__dict__[name]
+            if isinstance(original, (staticmethod, classmethod)):
+                wrapped = type(original)(self._wrap(original.__func__))
+            else:
+                wrapped = self._wrap(original)
+            self._originals.append((owner, name, original))
+            setattr(owner, name, wrapped)
+        return self
+
+    def __exit__(self, *exc):
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+
+
+def _count_webdriver_calls(driver) -> Dict[str, int]:
+    """Count WebDriver protocol commands, including those issued by elements"""
+    counter = {'calls': 0}
+    execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        counter['calls'] += 1
+        return execute(driver_command, params)
+
+    driver.execute = counting_execute
+    return counter
+
+
+def benchmark_scrapers(
+    server: FixtureServer,
+    queries: List[Tuple[str, str]],
+    platforms: List[str],
+    driver_factory=None,
+    max_results: int = 10,
+    offline_parsing: bool = False,
+) -> Dict[str, dict]:
+    """Run each platform's search_business over queries against the fixture server
+
+    Reports per platform: results, pages loaded, pages/sec, WebDriver
+    calls per result and time spent extracting contacts and parsing.
+    Page loads and website fetches are not rate limited.
+    """
+    driver_factory = driver_factory or (lambda: scraper_core.create_chrome_driver(headless=True))
+    # Every extraction path, inline or in parse_page, ends in the contact engine
+    extraction_targets = [(ContactExtractionEngine, 'extract')]
+    extraction_targets += [(cls, 'parse_page') for cls in SCRAPER_CLASSES.values()]
+
+    report = {}
+    for platform in platforms:
+        driver = driver_factory()
+        counter = _count_webdriver_calls(driver)
+        # Every fixture website is on the local server; don't throttle it
+        fetcher = scraper_core.WebsiteFetcher(rate_limiter=scraper_core.RateLimiter(requests_per_minute=1e9))
+        stats = {'queries': len(queries), 'results': 0, 'pages': 0, 'seconds': 0.0}
+        try:
+            with _CallTimer(extraction_targets) as timer:
+                for query, location in queries:
+                    scraper = SCRAPER_CLASSES[platform](driver, website_fetcher=fetcher)
+                    scraper.base_url = server.local_url(PLATFORMS[platform]['base_url'])
+                    scraper.max_results = max_results
+                    scraper.offline_parsing = offline_parsing
+
+                    start = time.perf_counter()
+                    results = scraper_core.search_platform(scraper, query, location)
+                    stats['seconds'] += time.perf_counter() - start
+                    stats['results'] += len(results)
+                    stats['pages'] += scraper.pages_loaded
+        finally:
+            fetcher.close()
+            driver.quit()
+
+        stats['seconds'] = round(stats['seconds'], 3)
+        stats['pages_per_sec'] = round(stats['pages'] / stats['seconds'], 2) if stats['seconds'] else 0.0
+        stats['webdriver_calls'] = counter['calls']
+        stats['webdriver_calls_per_result'] = (
+            round(counter['calls'] / stats['results'], 1) if stats['results'] else None
+        )
+        stats['extraction_ms'] = round(timer.seconds * 1000, 1)
+        stats['extraction_calls'] = timer.calls
+        report[platform] = stats
+        logger.info(
+            f"{platform}: {stats['results']} results, {stats['pages_per_sec']} pages/s, "
+            f"{stats['webdriver_calls_per_result']} WebDriver calls/result"
+        )
+    return report
+
+
+def compare_to_baseline(report: Dict[str, dict], baseline: Dict[str, dict], tolerance: float = 0.2) -> List[str]:
+    """Describe throughput regressions beyond tolerance (a fraction) vs a baseline report"""
+    regressions = []
+    for platform, stats in report.items():
+        previous = baseline.get(platform)
+        if not previous:
+            continue
+        if stats['pages_per_sec'] < previous['pages_per_sec'] * (1 - tolerance):
+            regressions.append(
+                f"{platform}: {stats['pages_per_sec']} pages/s, was {previous['pages_per_sec']}"
+            )
+        calls, previous_calls = stats['webdriver_calls_per_result'], previous.get('webdriver_calls_per_result')
+        if calls and previous_calls and calls > previous_calls * (1 + tolerance):
+            regressions.append(
+                f"{platform}: {calls} WebDriver calls/result, was {previous_calls}"
+            )
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Scraper Pro record/replay benchmark")
+    parser.add_argument(
+        "query_file",
+        nargs="?",
+        help="File with one query per line, optionally '<query>\\t<location>' (default: built-in queries)"
+    )
+    parser.add_argument(
+        "--fixtures",
+        metavar="DIR",
+        help="Snapshot store recorded with scraper_cli.py --snapshots (default: synthetic pages)"
+    )
+    parser.add_argument(
+        "-p", "--platforms",
+        nargs="+",
+        choices=sorted(SCRAPER_CLASSES),
+        default=sorted(SCRAPER_CLASSES),
+        help="Platforms to benchmark"
+    )
+    parser.add_argument("--location", default="Dubai", help="Default location for queries without one")
+    parser.add_argument("--results", type=int, default=10, help="Results per query")
+    parser.add_argument(
+        "--offline-parsing",
+        action="store_true",
+        help="Parse page_source with BeautifulSoup instead of querying live elements"
+    )
+    parser.add_argument("-o", "--output", help="Write the report as JSON")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed fractional slowdown vs the baseline"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Only serve the fixtures until interrupted"
+    )
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.query_file:
+        queries = scraper_core.parse_query_file(args.query_file, args.location)
+    else:
+        queries = [("dentist", args.location), ("coffee shop", args.location)]
+
+    store = None
+    if args.fixtures:
+        store = scraper_core.SnapshotStore(args.fixtures)
+        server = FixtureServer.from_snapshot_store(store)
+    else:
+        server = FixtureServer(synthetic_fixtures(queries, args.results))
+    server.start()
+
+    try:
+        if args.serve:
+            for platform in args.platforms:
+                print(f"{platform}: {server.local_url(PLATFORMS[platform]['base_url'])}")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                return 0
+
+        report = benchmark_scrapers(
+            server,
+            queries,
+            args.platforms,
+            max_results=args.results,
+            offline_parsing=args.offline_parsing,
+        )
+    finally:
+        server.close()
+        if store:
+            store.close()
+
+    if server.misses:
+        logger.warning(f"{server.misses} of {server.requests_served} requests had no fixture")
+    print(json.dumps(report, indent=4))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_to_baseline(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            logger.error(f"Regression: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+"""Headless batch entry point for Scraper Pro
+
+Runs the platform scrapers over a file of queries and streams results to a
+JSON Lines, CSV, Parquet or SQLite file, without importing the CustomTkinter GUI. Suitable for cron
+jobs and schedulers on machines without a display.
+
+Usage:
+    python scraper_cli.py queries.txt -o results.jsonl -p instagram twitter
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import scraper_core
+from scraper_core import logger
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Scraper Pro headless batch mode")
+    parser.add_argument(
+        "query_file",
+        nargs="?",
+        help="File with one query per line, optionally '<query>\\t<location>\\t<priority>'"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Result file, format picked from the extension: .jsonl, .csv, .parquet, .sqlite "
+             "(default: scraper_results_<timestamp>.jsonl)"
+    )
+    parser.add_argument(
+        "-p", "--platforms",
+        nargs="+",
+        choices=sorted(scraper_core.SCRAPER_CLASSES),
+        default=sorted(scraper_core.SCRAPER_CLASSES),
+        help="Platforms to search"
+    )
+    parser.add_argument("--location", default="", help="Default location for queries without one")
+    parser.add_argument("--proxy", help="Proxy server for the browser, e.g. http://host:port")
+    parser.add_argument(
+        "--proxy-file",
+        metavar="PATH",
+        help="Pick browser proxies from a file (one per line), validated before the run"
+    )
+    parser.add_argument(
+        "--proxy-health-url",
+        default=scraper_core.PROXY_HEALTH_URL,
+        help="URL fetched through each proxy to validate it and measure latency"
+    )
+    parser.add_argument("--visible", action="store_true", help="Show the browser window")
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="Number of concurrent browser sessions"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        nargs="+",
+        metavar="PLATFORM=N",
+        default=[],
+        help="Override how many browser sessions may search a platform at once"
+    )
+    parser.add_argument(
+        "--adaptive-rate",
+        action="store_true",
+        help="Tune each platform's request rate and concurrency from observed latency and errors"
+    )
+    parser.add_argument(
+        "--max-rpm",
+        type=float,
+        help="With --adaptive-rate, never exceed this many page loads per minute on a platform"
+    )
+    parser.add_argument(
+        "--max-pages-per-session",
+        type=int,
+        default=50,
+        help="Recycle a browser session after this many page loads"
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="Persistent page cache (SQLite file) reused across runs"
+    )
+    parser.add_argument("--cache-ttl", type=float, default=24.0, help="Cache TTL in hours")
+    parser.add_argument("--cache-max-mb", type=int, default=500, help="Cache size limit in MB")
+    parser.add_argument(
+        "--job-db",
+        metavar="PATH",
+        help="Checkpoint progress to a job database (SQLite file) and resume an "
+             "interrupted run of the same queries and platforms"
+    )
+    parser.add_argument(
+        "--visited",
+        metavar="PATH",
+        help="Persistent visited-URL set (SQLite file); profiles visited before are skipped"
+    )
+    parser.add_argument("--visited-ttl", type=float, default=168.0, help="Visited URL TTL in hours")
+    parser.add_argument(
+        "--offline-parsing",
+        action="store_true",
+        help="Parse page_source with BeautifulSoup instead of querying live elements"
+    )
+    parser.add_argument(
+        "--parse-html",
+        nargs="+",
+        metavar="HTML_FILE",
+        help="Parse saved pages of one platform (-p) without a browser, then exit"
+    )
+    parser.add_argument(
+        "--snapshots",
+        metavar="DIR",
+        help="Archive every fetched page into a snapshot store"
+    )
+    parser.add_argument(
+        "--replay-snapshots",
+        metavar="DIR",
+        help="Re-extract results for one platform (-p) from a snapshot store, then exit"
+    )
+    parser.add_argument(
+        "--export-store",
+        metavar="DB",
+        help="Export entities from a .sqlite result store to --output, then exit"
+    )
+    parser.add_argument(
+        "--since-hours",
+        type=float,
+        help="With --export-store, only entities seen in the last N hours"
+    )
+    parser.add_argument(
+        "--merged-output",
+        metavar="PATH",
+        help="Also write results merged across platforms into one record per entity"
+    )
+    parser.add_argument(
+        "--extraction-workers",
+        type=int,
+        default=0,
+        help="Process pool size for contact extraction (0 = off)"
+    )
+    parser.add_argument(
+        "--benchmark-extraction",
+        action="store_true",
+        help="Benchmark contact extraction throughput and exit"
+    )
+    parser.add_argument(
+        "--benchmark-dedup",
+        type=int,
+        metavar="RECORDS",
+        help="Benchmark cross-platform deduplication on RECORDS synthetic results and exit"
+    )
+    parser.add_argument(
+        "--benchmark-rate-limiter",
+        action="store_true",
+        help="Check that requests queued behind a 429 backoff are spaced by the rate limit and exit"
+    )
+    return parser
+
+
+def reparse_pages(args) -> int:
+    """Run a platform's offline parser over saved HTML files or a snapshot store"""
+    if len(args.platforms) != 1:
+        logger.error("--parse-html and --replay-snapshots need exactly one platform (-p)")
+        return 2
+    platform = args.platforms[0]
+
+    output = args.output or f"scraper_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    try:
+        sink = scraper_core.open_result_sink(output)
+    except (ImportError, ValueError) as e:
+        logger.error(str(e))
+        return 2
+
+    extraction_pool = None
+    if args.extraction_workers > 0:
+        extraction_pool = scraper_core.ExtractionPool(args.extraction_workers)
+    store = None
+    if args.replay_snapshots:
+        store = scraper_core.SnapshotStore(args.replay_snapshots)
+        results = scraper_core.replay_snapshots(store, platform, extraction_pool)
+    else:
+        results = scraper_core.parse_saved_pages(platform, args.parse_html, extraction_pool)
+
+    try:
+        with sink:
+            sink.write_many(results)
+    finally:
+        if extraction_pool:
+            extraction_pool.shutdown()
+        if store:
+            store.close()
+
+    logger.info(f"Parsed {sink.count} results into {output}")
+    return 0
+
+
+def write_merged(resolver: scraper_core.EntityResolver, path: str):
+    """Write a resolver's merged entities to a result file"""
+    with scraper_core.open_result_sink(path) as sink:
+        sink.write_many(resolver.entities())
+    stats = resolver.stats()
+    logger.info(
+        f"Merged {stats['records']} results into {stats['entities']} entities in {path}"
+    )
+
+
+def export_store(args) -> int:
+    """Export a result store's entities, optionally only recently seen ones"""
+    output = args.output or f"scraper_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    since = time.time() - args.since_hours * 3600 if args.since_hours else None
+    store = scraper_core.ResultStore(args.export_store)
+    try:
+        total = store.export(output, since=since)
+        if args.merged_output:
+            resolver = scraper_core.EntityResolver()
+            resolver.add_many(store.iter_entities(since=since))
+            write_merged(resolver, args.merged_output)
+    except (ImportError, ValueError) as e:
+        logger.error(str(e))
+        return 2
+    finally:
+        store.close()
+
+    logger.info(f"Exported {total} entities from {args.export_store} to {output}")
+    return 0
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.benchmark_extraction:
+        stats = scraper_core.benchmark_extraction()
+        print(json.dumps(stats, indent=4))
+        return 0
+
+    if args.benchmark_dedup:
+        stats = scraper_core.benchmark_dedup(args.benchmark_dedup)
+        print(json.dumps(stats, indent=4))
+        return 0
+
+    if args.benchmark_rate_limiter:
+        stats = scraper_core.benchmark_rate_limiter()
+        print(json.dumps(stats, indent=4))
+        return 0
+
+    if args.parse_html or args.replay_snapshots:
+        return reparse_pages(args)
+
+    if args.export_store:
+        return export_store(args)
+
+    if not args.query_file:
+        logger.error("A query file is required")
+        return 2
+
+    queries = scraper_core.parse_query_file(args.query_file, args.location, with_priority=True)
+    if not queries:
+        logger.error(f"No queries found in {args.query_file}")
+        return 2
+
+    max_concurrency = {}
+    for item in args.max_concurrency:
+        platform, _, limit = item.partition('=')
+        if platform not in scraper_core.PLATFORMS or not limit.isdigit() or int(limit) < 1:
+            logger.error(f"Invalid --max-concurrency value: {item}")
+            return 2
+        max_concurrency[platform] = int(limit)
+
+    if args.max_rpm is not None and not args.adaptive_rate:
+        logger.error("--max-rpm only applies with --adaptive-rate")
+        return 2
+
+    proxy_manager = None
+    if args.proxy_file:
+        proxy_manager = scraper_core.ProxyManager(args.proxy_file, health_url=args.proxy_health_url)
+        if not any(proxy_manager.validate_all().values()):
+            logger.error(f"No working proxy in {args.proxy_file}")
+            return 2
+
+    output = args.output or f"scraper_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    try:
+        # A checkpointed task counts as delivered once its results are
+        # written, so don't buffer them
+        sink = scraper_core.open_result_sink(output, **({'flush_every': 1} if args.job_db else {}))
+    except (ImportError, ValueError) as e:
+        logger.error(str(e))
+        return 2
+
+    credentials = None
+    if os.environ.get("INSTAGRAM_USERNAME") and os.environ.get("INSTAGRAM_PASSWORD"):
+        credentials = (os.environ["INSTAGRAM_USERNAME"], os.environ["INSTAGRAM_PASSWORD"])
+
+    extraction_pool = None
+    if args.extraction_workers > 0:
+        extraction_pool = scraper_core.ExtractionPool(args.extraction_workers)
+
+    response_cache = None
+    if args.cache:
+        response_cache = scraper_core.ResponseCache(
+            args.cache,
+            ttl=args.cache_ttl * 3600,
+            max_bytes=args.cache_max_mb * 1024 * 1024
+        )
+
+    snapshot_store = None
+    if args.snapshots:
+        snapshot_store = scraper_core.SnapshotStore(args.snapshots)
+
+    frontier = None
+    if args.visited:
+        frontier = scraper_core.CrawlFrontier(args.visited, ttl=args.visited_ttl * 3600)
+
+    job_store = None
+    if args.job_db:
+        job_store = scraper_core.JobStore(args.job_db)
+
+    resolver = scraper_core.EntityResolver() if args.merged_output else None
+
+    if proxy_manager:
+        # Re-admits ejected proxies and drops failing ones during the run
+        proxy_manager.start_health_checks()
+
+    try:
+        with sink:
+            for result in scraper_core.run_batch(
+                queries,
+                platforms=args.platforms,
+                headless=not args.visible,
+                proxy=args.proxy,
+                extraction_pool=extraction_pool,
+                instagram_credentials=credentials,
+                workers=args.workers,
+                max_pages_per_session=args.max_pages_per_session,
+                response_cache=response_cache,
+                offline_parsing=args.offline_parsing,
+                snapshot_store=snapshot_store,
+                frontier=frontier,
+                job_store=job_store,
+                max_concurrency=max_concurrency,
+                proxy_manager=proxy_manager,
+                adaptive_throughput=args.adaptive_rate,
+                max_requests_per_minute=args.max_rpm,
+            ):
+                sink.write(result)
+                if resolver:
+                    resolver.add(result)
+    except KeyboardInterrupt:
+        logger.warning("Interrupted, partial results kept")
+        return 130
+    except Exception as e:
+        logger.error(f"Batch run failed: {str(e)}")
+        return 1
+    finally:
+        if extraction_pool:
+            extraction_pool.shutdown()
+        if response_cache:
+            response_cache.close()
+        if snapshot_store:
+            snapshot_store.close()
+        if frontier:
+            frontier.close()
+        if job_store:
+            job_store.close()
+        if proxy_manager:
+            proxy_manager.close()
+
+    logger.info(f"Wrote {sink.count} results for {len(queries)} queries to {output}")
+    if resolver:
+        try:
+            write_merged(resolver, args.merged_output)
+        except (ImportError, ValueError) as e:
+            logger.error(str(e))
+            return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())